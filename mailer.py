@@ -14,14 +14,18 @@ https://codedeckai.com
 import argparse
 import base64
 import json
+import os
 import random
 import re
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from email.mime.text import MIMEText
+from email.header import Header
 from pathlib import Path
 
+import google_auth_httplib2
+import httplib2
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
@@ -29,18 +33,49 @@ from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 from pymongo import MongoClient
 
+try:
+    import orjson
+except ImportError:  # Optional speedup; stdlib json is used otherwise
+    orjson = None
+
 # ============================================================================
 # FILE PATHS
 # ============================================================================
 
 SCOPES = ["https://www.googleapis.com/auth/gmail.send"]
+GMAIL_MAX_BATCH_SIZE = 50
+MONGO_NIN_LIMIT = 1000
 CONFIG_PATH = Path("config/config.json")
 CREDENTIALS_PATH = Path("config/credentials.json")
 TOKEN_PATH = Path("data/token.json")
 PROGRESS_PATH = Path("data/progress.json")
+EVENTS_PATH = Path("data/progress.events.ndjson")
 EMAILS_PATH = Path("data/emails.json")
 TEMPLATE_PATH = Path("data/template.txt")
 
+# Dedicated RNG for spintax, shuffling and jitter; seed it for reproducible runs
+_RNG = random.Random()
+_choice = _RNG.choice
+_uniform = _RNG.uniform
+
+
+# ============================================================================
+# JSON HELPERS
+# ============================================================================
+
+def _json_loads(data: bytes | str):
+    """Parse JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj, indent: bool = False) -> bytes:
+    """Serialize to JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None).encode()
+
 
 # ============================================================================
 # CONFIG LOADER
@@ -97,12 +132,36 @@ def load_template() -> tuple[str, str]:
 # GMAIL AUTHENTICATION
 # ============================================================================
 
+def _encode_header(value: str) -> str:
+    """Make a header value safe to write raw: single line, RFC 2047 encoded if non-ASCII."""
+    value = " ".join(value.splitlines())
+    if value.isascii():
+        return value
+    return Header(value, "utf-8").encode(linesep="\r\n")
+
+
 class GmailAuth:
     """Handle Gmail OAuth2 authentication."""
 
-    def __init__(self):
+    def __init__(self, sender_name: str = "Mailer"):
         self.creds = None
         self.service = None
+        self._http = None
+
+        # Headers that are identical for every message in the campaign. Like
+        # MIMEText, ASCII bodies go out as 7bit and only others as base64,
+        # since base64-encoded plain text is a spam signal.
+        self._from_bytes = f"From: {_encode_header(sender_name)}\r\n".encode()
+        self._mime_prefix_7bit = (
+            b"MIME-Version: 1.0\r\n"
+            b"Content-Type: text/plain; charset=us-ascii\r\n"
+            b"Content-Transfer-Encoding: 7bit\r\n"
+        )
+        self._mime_prefix_base64 = (
+            b"MIME-Version: 1.0\r\n"
+            b"Content-Type: text/plain; charset=utf-8\r\n"
+            b"Content-Transfer-Encoding: base64\r\n"
+        )
 
     def authenticate(self):
         """Load or create OAuth credentials and build Gmail service."""
@@ -136,19 +195,42 @@ class GmailAuth:
                 f.write(self.creds.to_json())
             print(f"Token saved to {TOKEN_PATH}")
 
-        self.service = build("gmail", "v1", credentials=self.creds)
+        # build() would wrap its own persistent httplib2.Http the same way; building
+        # it here keeps a handle on self._http and shortens the timeout from 60s to 30s
+        self._http = google_auth_httplib2.AuthorizedHttp(
+            self.creds, http=httplib2.Http(timeout=30)
+        )
+        # static_discovery=True is already the default; spelled out so the
+        # bundled discovery document keeps being used if the call changes
+        self.service = build(
+            "gmail", "v1", http=self._http, static_discovery=True
+        )
         print("Gmail authenticated successfully!\n")
         return self.service
 
-    def send_email(self, to_email: str, subject: str, body: str, sender_name: str) -> bool:
+    def _encode_message(self, to_email: str, subject: str, body: str) -> str:
+        """Assemble the raw RFC 2822 message from the precomputed header block."""
+        if body.isascii():
+            mime_prefix = self._mime_prefix_7bit
+            encoded_body = body.replace("\r\n", "\n").replace("\n", "\r\n").encode()
+        else:
+            mime_prefix = self._mime_prefix_base64
+            encoded_body = base64.encodebytes(body.encode()).replace(b"\n", b"\r\n")
+
+        raw = b"".join([
+            self._from_bytes,
+            f"To: {_encode_header(to_email)}\r\n".encode(),
+            f"Subject: {_encode_header(subject)}\r\n".encode(),
+            mime_prefix,
+            b"\r\n",
+            encoded_body,
+        ])
+        return base64.urlsafe_b64encode(raw).decode()
+
+    def send_email(self, to_email: str, subject: str, body: str) -> bool:
         """Send an email via Gmail API."""
         try:
-            message = MIMEText(body)
-            message["to"] = to_email
-            message["subject"] = subject
-            message["from"] = sender_name
-
-            encoded = base64.urlsafe_b64encode(message.as_bytes()).decode()
+            encoded = self._encode_message(to_email, subject, body)
             self.service.users().messages().send(
                 userId="me", body={"raw": encoded}
             ).execute()
@@ -156,43 +238,150 @@ class GmailAuth:
         except HttpError as e:
             raise Exception(f"Gmail API error: {e}")
 
+    def send_batch(self, messages: list[tuple[str, str, str]]) -> list[str | None]:
+        """
+        Send several emails in a single Gmail batch HTTP request.
+
+        Takes (to_email, subject, body) tuples and returns one
+        entry per message: None if it was sent, otherwise the error message.
+        """
+        # A batch of one gains nothing from the multipart batch envelope
+        if len(messages) == 1:
+            try:
+                self.send_email(*messages[0])
+                return [None]
+            except Exception as e:
+                return [str(e)]
+
+        errors = [None] * len(messages)
+
+        def on_response(request_id, response, exception):
+            if exception is not None:
+                errors[int(request_id)] = f"Gmail API error: {exception}"
+
+        batch = self.service.new_batch_http_request(callback=on_response)
+        for i, (to_email, subject, body) in enumerate(messages):
+            encoded = self._encode_message(to_email, subject, body)
+            batch.add(
+                self.service.users().messages().send(userId="me", body={"raw": encoded}),
+                request_id=str(i),
+            )
+
+        try:
+            batch.execute()
+        except HttpError as e:
+            return [f"Gmail API error: {e}"] * len(messages)
+
+        return errors
+
 
 # ============================================================================
 # SPINTAX PROCESSOR
 # ============================================================================
 
-def process_spintax(text: str) -> str:
-    """
-    Process spintax in text: {option1|option2|option3} -> random choice.
+_TOKEN_RE = re.compile(r"\{\{(\w+)\}\}|[{}|]|[^{}|]+")
+
+
+def compile_template(text: str) -> list[tuple]:
     """
-    pattern = r"\{([^{}]+)\}"
+    Parse a template once into parts that can be rendered per recipient.
 
-    def replace_spin(match):
-        options = match.group(1).split("|")
-        return random.choice(options)
+    Each part is one of:
+        ("lit", text)        literal text
+        ("var", name)        {{name}} placeholder
+        ("spin", options)    {option1|option2} spintax, options pre-compiled
+    """
+    tokens = [
+        ("var", m.group(1)) if m.group(1) is not None else ("text", m.group(0))
+        for m in _TOKEN_RE.finditer(text)
+    ]
+    spin_braces = _match_spin_braces(tokens)
+
+    # Build nested parts with an explicit stack so deep nesting can't overflow
+    parts = []
+    frames = []
+    literal = []
+
+    def flush():
+        if literal:
+            parts.append(("lit", "".join(literal)))
+            literal.clear()
+
+    for i, (kind, value) in enumerate(tokens):
+        if kind == "var":
+            flush()
+            parts.append(("var", value))
+        elif value == "{" and i in spin_braces:
+            flush()
+            frames.append(([], parts))
+            parts = []
+        elif value == "|" and frames:
+            flush()
+            frames[-1][0].append(parts)
+            parts = []
+        elif value == "}" and i in spin_braces:
+            flush()
+            options, outer = frames.pop()
+            options.append(parts)
+            outer.append(("spin", tuple(options)))
+            parts = outer
+        else:
+            # Unmatched braces and stray pipes are kept as-is
+            literal.append(value)
 
-    while re.search(pattern, text):
-        text = re.sub(pattern, replace_spin, text)
+    flush()
+    return parts
 
-    return text
 
+def _match_spin_braces(tokens: list[tuple]) -> set[int]:
+    """
+    Return indexes of '{' and '}' tokens that form spintax groups.
 
-def replace_variables(text: str, variables: dict) -> str:
-    """Replace {{variable}} placeholders with values."""
-    for key, value in variables.items():
-        text = text.replace(f"{{{{{key}}}}}", value)
-    return text
+    Braces are paired in one pass. Like the old regex, a group is only
+    spintax if it is non-empty and every group nested inside it is too.
+    """
+    spin_braces = set()
+    open_stack = []  # [token index, contains an invalid group]
+
+    for i, (kind, value) in enumerate(tokens):
+        if kind != "text":
+            continue
+        if value == "{":
+            open_stack.append([i, False])
+        elif value == "}" and open_stack:
+            start, has_invalid = open_stack.pop()
+            if i > start + 1 and not has_invalid:
+                spin_braces.update((start, i))
+            elif open_stack:
+                open_stack[-1][1] = True
+
+    return spin_braces
+
+
+def render_template(parts: list[tuple], variables: dict) -> str:
+    """Render compiled template parts, picking a random option for each spintax."""
+    out = []
+    stack = [iter(parts)]
+    while stack:
+        for kind, value in stack[-1]:
+            if kind == "lit":
+                out.append(value)
+            elif kind == "var":
+                out.append(variables.get(value, value))
+            else:
+                stack.append(iter(_choice(value)))
+                break
+        else:
+            stack.pop()
+    return "".join(out)
 
 
-def build_message(first_name: str, subject_template: str, body_template: str) -> tuple[str, str]:
+def build_message(first_name: str, subject_parts: list[tuple], body_parts: list[tuple]) -> tuple[str, str]:
     """Build personalized subject and body with random variations."""
     variables = {"first_name": first_name}
 
-    subject = replace_variables(subject_template, variables)
-    subject = process_spintax(subject)
-
-    body = replace_variables(body_template, variables)
-    body = process_spintax(body)
+    subject = render_template(subject_parts, variables)
+    body = render_template(body_parts, variables)
 
     return subject, body
 
@@ -201,8 +390,28 @@ def build_message(first_name: str, subject_template: str, body_template: str) ->
 # PROGRESS TRACKER
 # ============================================================================
 
+def _fsync_dir(path: Path):
+    """Persist a rename inside path. Directories can't be opened on Windows, so skip there."""
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
 class ProgressTracker:
-    """Track email sending progress for resume capability."""
+    """
+    Track email sending progress for resume capability.
+
+    Each send/failure is appended to data/progress.events.ndjson; the full
+    progress.json snapshot is only rewritten every SNAPSHOT_EVERY events and
+    on close(). On load, events newer than the snapshot are replayed.
+    """
+
+    SNAPSHOT_EVERY = 50
+    FSYNC_EVERY = 10
 
     def __init__(self):
         self.data = {
@@ -213,42 +422,121 @@ class ProgressTracker:
             "daily_count": 0,
             "daily_date": None,
         }
+        self._sent_lower = set()
+        self._events = None
+        self._unsaved_events = 0
         self._load()
 
     def _load(self):
+        loaded = False
         if PROGRESS_PATH.exists():
             try:
-                with open(PROGRESS_PATH) as f:
-                    self.data = json.load(f)
-                print(f"Loaded progress: {len(self.data['sent'])} sent, {len(self.data['failed'])} failed")
+                self.data = _json_loads(PROGRESS_PATH.read_bytes())
+                self._sent_lower = {e.lower() for e in self.data["sent"]}
+                loaded = True
             except json.JSONDecodeError:
                 print("Warning: Could not parse progress file, starting fresh")
 
+        replayed = self._replay_events()
+
+        if loaded or replayed:
+            print(f"Loaded progress: {len(self.data['sent'])} sent, {len(self.data['failed'])} failed")
+
+    def _replay_events(self) -> int:
+        """Apply events logged after the last snapshot. Returns how many were applied."""
+        if not EVENTS_PATH.exists():
+            return 0
+
+        last_updated = self.data.get("last_updated") or ""
+        replayed = 0
+        with open(EVENTS_PATH, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    event = _json_loads(line)
+                except json.JSONDecodeError:
+                    # Partial line from an interrupted write
+                    continue
+
+                if event["ts"] <= last_updated:
+                    continue
+
+                if event["t"] == "sent":
+                    self._apply_sent(event["e"], event["ts"][:10])
+                elif event["t"] == "failed":
+                    self.data["failed"][event["e"]] = event["r"]
+                replayed += 1
+
+        self._unsaved_events = replayed
+        return replayed
+
     def _save(self):
         self.data["last_updated"] = datetime.now(timezone.utc).isoformat()
         PROGRESS_PATH.parent.mkdir(parents=True, exist_ok=True)
 
+        # The snapshot must be on disk before the event log it replaces is removed
         temp_path = PROGRESS_PATH.with_suffix(".tmp")
-        with open(temp_path, "w") as f:
-            json.dump(self.data, f, indent=2)
+        with open(temp_path, "wb") as f:
+            f.write(_json_dumps(self.data, indent=True))
+            f.flush()
+            os.fsync(f.fileno())
         temp_path.replace(PROGRESS_PATH)
+        _fsync_dir(PROGRESS_PATH.parent)
+
+        # The snapshot now covers every logged event
+        if self._events:
+            self._events.close()
+            self._events = None
+        EVENTS_PATH.unlink(missing_ok=True)
+        self._unsaved_events = 0
+
+    def _log_event(self, event: dict):
+        if self._events is None:
+            EVENTS_PATH.parent.mkdir(parents=True, exist_ok=True)
+            self._events = open(EVENTS_PATH, "a", buffering=1, encoding="utf-8")
+
+        self._events.write(_json_dumps(event).decode() + "\n")
+        self._unsaved_events += 1
+
+        if self._unsaved_events % self.FSYNC_EVERY == 0:
+            os.fsync(self._events.fileno())
+        if self._unsaved_events >= self.SNAPSHOT_EVERY:
+            self._save()
+
+    def close(self):
+        """Write a final snapshot if anything was logged since the last one."""
+        if self._unsaved_events:
+            self._save()
+
+    @property
+    def sent_emails(self) -> set[str]:
+        """Lowercased addresses that have already been sent to."""
+        return self._sent_lower
 
     def is_sent(self, email: str) -> bool:
-        return email.lower() in [e.lower() for e in self.data["sent"]]
+        return email.lower() in self._sent_lower
 
     def mark_sent(self, email: str):
-        self.data["sent"].append(email)
-        self._update_daily_count()
-        self._save()
+        now = datetime.now(timezone.utc)
+        self._apply_sent(email, now.date().isoformat())
+        self._log_event({"t": "sent", "e": email, "ts": now.isoformat()})
 
     def mark_failed(self, email: str, reason: str):
         self.data["failed"][email] = reason
-        self._save()
+        self._log_event({
+            "t": "failed",
+            "e": email,
+            "r": reason,
+            "ts": datetime.now(timezone.utc).isoformat(),
+        })
+
+    def _apply_sent(self, email: str, day: str):
+        self.data["sent"].append(email)
+        self._sent_lower.add(email.lower())
+        self._update_daily_count(day)
 
-    def _update_daily_count(self):
-        today = datetime.now(timezone.utc).date().isoformat()
-        if self.data.get("daily_date") != today:
-            self.data["daily_date"] = today
+    def _update_daily_count(self, day: str):
+        if self.data.get("daily_date") != day:
+            self.data["daily_date"] = day
             self.data["daily_count"] = 1
         else:
             self.data["daily_count"] = self.data.get("daily_count", 0) + 1
@@ -268,6 +556,7 @@ class ProgressTracker:
             "daily_count": 0,
             "daily_date": None,
         }
+        self._sent_lower = set()
         self._save()
         print("Progress reset!")
 
@@ -276,15 +565,29 @@ class ProgressTracker:
 # RECIPIENT FETCHER
 # ============================================================================
 
+_EMAIL_RE = re.compile(r"^\s*([^@\s]+@[^@\s]+\.[^@\s]+)\s*$")
+_NAME_RE = re.compile(r"\S+")
+
+
 def extract_first_name(full_name: str | None) -> str:
     """Extract first name from full name, with fallback."""
-    if not full_name or not full_name.strip():
-        return "there"
-    return full_name.strip().split()[0]
+    match = _NAME_RE.search(full_name or "")
+    return match.group(0) if match else "there"
 
 
-def fetch_from_mongodb(config: dict) -> dict[str, dict]:
-    """Fetch recipients from MongoDB. Returns {email: {email, first_name, source}}."""
+def normalize_email(email) -> str | None:
+    """Strip and lowercase an email address. Returns None if it is missing or invalid."""
+    if not isinstance(email, str):
+        return None
+    match = _EMAIL_RE.match(email)
+    return match.group(1).lower() if match else None
+
+
+def fetch_from_mongodb(config: dict, sent: set[str] | None = None) -> dict[str, dict]:
+    """
+    Fetch recipients from MongoDB. Returns {email: {email, first_name, source}}.
+    Already-sent addresses are excluded in the query when there are few enough.
+    """
     mongo_config = config.get("mongodb", {})
     if not mongo_config.get("enabled", False):
         return {}
@@ -297,39 +600,41 @@ def fetch_from_mongodb(config: dict) -> dict[str, dict]:
     name_field = mongo_config.get("name_field", "name")
     query_filter = mongo_config.get("filter", {})
 
+    # Let the server skip sent addresses rather than transferring them; large
+    # lists would bloat the query, so those are filtered locally instead
+    if sent and len(sent) < MONGO_NIN_LIMIT:
+        sent_filter = {email_field: {"$nin": list(sent)}}
+        query_filter = {"$and": [query_filter, sent_filter]} if query_filter else sent_filter
+
     print(f"Connecting to MongoDB ({db_name}/{coll_name})...")
     try:
-        client = MongoClient(uri, serverSelectionTimeoutMS=10000)
+        client = MongoClient(
+            uri,
+            serverSelectionTimeoutMS=10000,
+            maxPoolSize=4,
+            compressors="zstd,zlib",
+        )
         db = client[db_name]
         collection = db[coll_name]
 
-        cursor = collection.find(query_filter, {email_field: 1, name_field: 1})
-
-        count = 0
-        for doc in cursor:
-            email = doc.get(email_field)
-            if not email or not isinstance(email, str):
-                continue
-
-            email = email.strip().lower()
-            if not email or "@" not in email:
-                continue
-
-            if email in recipients:
-                continue
-
-            full_name = doc.get(name_field)
-            first_name = extract_first_name(full_name)
-
-            recipients[email] = {
-                "email": email,
-                "first_name": first_name,
-                "source": "MongoDB",
-            }
-            count += 1
+        projection = {email_field: 1, name_field: 1, "_id": 0}
+        cursor = collection.find(query_filter, projection).batch_size(1000)
+
+        normalized = (
+            (email, doc.get(name_field))
+            for doc in cursor
+            if (email := normalize_email(doc.get(email_field)))
+        )
+        for email, full_name in normalized:
+            if email not in recipients:
+                recipients[email] = {
+                    "email": email,
+                    "first_name": extract_first_name(full_name),
+                    "source": "MongoDB",
+                }
 
         client.close()
-        print(f"  Found {count} recipients from MongoDB")
+        print(f"  Found {len(recipients)} recipients from MongoDB")
 
     except Exception as e:
         print(f"  ERROR connecting to MongoDB: {e}")
@@ -344,29 +649,18 @@ def fetch_from_json() -> dict[str, dict]:
 
     recipients = {}
     try:
-        with open(EMAILS_PATH) as f:
-            data = json.load(f)
-
-        for entry in data.get("recipients", []):
-            email = entry.get("email")
-            if not email or not isinstance(email, str):
-                continue
-
-            email = email.strip().lower()
-            if not email or "@" not in email:
-                continue
+        data = _json_loads(EMAILS_PATH.read_bytes())
 
-            if email in recipients:
-                continue
-
-            name = entry.get("name")
-            first_name = extract_first_name(name)
-
-            recipients[email] = {
+        # Walk the list backwards so the first entry for a duplicate address wins
+        recipients = {
+            email: {
                 "email": email,
-                "first_name": first_name,
+                "first_name": extract_first_name(entry.get("name")),
                 "source": "JSON",
             }
+            for entry in reversed(data.get("recipients", []))
+            if (email := normalize_email(entry.get("email")))
+        }
 
         print(f"  Found {len(recipients)} recipients from emails.json")
 
@@ -376,30 +670,38 @@ def fetch_from_json() -> dict[str, dict]:
     return recipients
 
 
-def fetch_recipients(config: dict) -> list[dict]:
+def fetch_recipients(config: dict, progress: ProgressTracker) -> tuple[list[dict], int]:
     """
-    Fetch recipients from all configured sources and deduplicate.
-    Sources: MongoDB (if enabled) + data/emails.json (if exists).
-    Returns list of {email, first_name, source}.
+    Fetch recipients from all configured sources, deduplicate and drop
+    those already sent. Sources: MongoDB (if enabled) + data/emails.json (if exists).
+    Returns (list of unsent {email, first_name, source}, number fetched before filtering).
     """
+    sent = progress.sent_emails
     all_recipients = {}
 
+    # Both sources are blocking I/O, so load them side by side
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        mongo_future = executor.submit(fetch_from_mongodb, config, sent)
+        json_future = executor.submit(fetch_from_json)
+        mongo_recipients = mongo_future.result()
+        json_recipients = json_future.result()
+
     # MongoDB source
-    mongo_recipients = fetch_from_mongodb(config)
     all_recipients.update(mongo_recipients)
 
     # JSON file source
-    json_recipients = fetch_from_json()
     for email, data in json_recipients.items():
         if email not in all_recipients:
             all_recipients[email] = data
 
+    # Skip already sent before building the list to shuffle
+    recipients = [data for email, data in all_recipients.items() if email not in sent]
+
     # Shuffle for varied sending order
-    recipients = list(all_recipients.values())
-    random.shuffle(recipients)
+    _RNG.shuffle(recipients)
 
-    print(f"\nTotal unique recipients: {len(recipients)}")
-    return recipients
+    print(f"\nUnique unsent recipients: {len(recipients)}")
+    return recipients, len(all_recipients)
 
 
 # ============================================================================
@@ -412,18 +714,21 @@ def calculate_delay(config: dict) -> float:
     base = rate.get("base_interval_seconds", 180)
     jitter_min = rate.get("jitter_range_min", 0)
     jitter_max = rate.get("jitter_range_max", 45)
-    jitter = random.uniform(jitter_min, jitter_max)
+    jitter = _uniform(jitter_min, jitter_max)
     return base + jitter
 
 
 def wait_with_countdown(seconds: float):
-    """Wait with a countdown display."""
+    """Wait with a countdown display (plain sleep when not attached to a terminal)."""
+    if not sys.stdout.isatty():
+        time.sleep(seconds)
+        return
+
     end_time = time.time() + seconds
-    while time.time() < end_time:
-        remaining = int(end_time - time.time())
-        mins, secs = divmod(remaining, 60)
+    while (remaining := end_time - time.time()) > 0:
+        mins, secs = divmod(int(remaining), 60)
         print(f"\r  Waiting: {mins:02d}:{secs:02d} ", end="", flush=True)
-        time.sleep(1)
+        time.sleep(min(remaining, 5))
     print("\r" + " " * 30 + "\r", end="")
 
 
@@ -443,9 +748,12 @@ def run_campaign(dry_run: bool = False, limit: int | None = None, test_email: st
     sender_name = config.get("sender_name", "Mailer")
     rate = config.get("rate_limiting", {})
     daily_limit = rate.get("daily_limit", 100)
+    batch_size = min(max(rate.get("batch_size", 1), 1), GMAIL_MAX_BATCH_SIZE)
 
     # Load email template
     subject_template, body_template = load_template()
+    subject_parts = compile_template(subject_template)
+    body_parts = compile_template(body_template)
 
     # Initialize progress tracker
     progress = ProgressTracker()
@@ -466,18 +774,24 @@ def run_campaign(dry_run: bool = False, limit: int | None = None, test_email: st
         name_part = test_email.split("@")[0]
         first_name = name_part.split(".")[0].capitalize()
         recipients = [{"email": test_email, "first_name": first_name, "source": "Test"}]
+        fetched = len(recipients)
     else:
         print("\nFetching recipients...")
-        recipients = fetch_recipients(config)
+        recipients, fetched = fetch_recipients(config, progress)
+
+    # Recipients were fetched but every one of them was already sent
+    if not recipients and fetched:
+        print("\nAll emails have been sent!")
+        return
 
     if not recipients:
         print("No recipients found!")
         print("Add recipients to data/emails.json and/or enable MongoDB in config/config.json.")
         return
 
-    # Filter out already sent
+    # Filter out already sent (fetched recipients are pre-filtered; this covers --to)
     pending = [r for r in recipients if not progress.is_sent(r["email"])]
-    print(f"Pending emails: {len(pending)} (skipping {len(recipients) - len(pending)} already sent)")
+    print(f"Pending emails: {len(pending)}")
 
     if not pending:
         print("\nAll emails have been sent!")
@@ -498,7 +812,7 @@ def run_campaign(dry_run: bool = False, limit: int | None = None, test_email: st
         print("\n[DRY RUN MODE - No emails will be sent]\n")
         print("Recipients to send:")
         for i, r in enumerate(pending[:20], 1):
-            subject, _ = build_message(r["first_name"], subject_template, body_template)
+            subject, _ = build_message(r["first_name"], subject_parts, body_parts)
             print(f"  {i}. {r['email']} ({r['first_name']}) - {r['source']}")
             print(f"      Subject: {subject}")
         if len(pending) > 20:
@@ -507,7 +821,7 @@ def run_campaign(dry_run: bool = False, limit: int | None = None, test_email: st
         print("\n\nSample email preview:")
         print("-" * 40)
         sample = pending[0]
-        subject, body = build_message(sample["first_name"], subject_template, body_template)
+        subject, body = build_message(sample["first_name"], subject_parts, body_parts)
         print(f"To: {sample['email']}")
         print(f"From: {sender_name}")
         print(f"Subject: {subject}")
@@ -516,41 +830,57 @@ def run_campaign(dry_run: bool = False, limit: int | None = None, test_email: st
         return
 
     # Authenticate Gmail
-    gmail = GmailAuth()
+    gmail = GmailAuth(sender_name)
     gmail.authenticate()
 
     # Send emails
     print(f"\nStarting to send {len(pending)} emails...")
     print("Press Ctrl+C to pause (progress is saved)\n")
 
-    sent_count = 0
-    for i, recipient in enumerate(pending, 1):
-        email = recipient["email"]
-        first_name = recipient["first_name"]
-
-        subject, body = build_message(first_name, subject_template, body_template)
-
-        print(f"[{i}/{len(pending)}] Sending to {email}...", end=" ", flush=True)
+    # Render every message up front so the send loop is pure network I/O
+    messages = [
+        (r["email"], *build_message(r["first_name"], subject_parts, body_parts))
+        for r in pending
+    ]
 
-        try:
-            gmail.send_email(email, subject, body, sender_name)
-            progress.mark_sent(email)
-            sent_count += 1
-            print("Sent")
+    sent_count = 0
+    try:
+        for start in range(0, len(messages), batch_size):
+            batch = messages[start:start + batch_size]
 
-        except Exception as e:
-            error_msg = str(e)
-            progress.mark_failed(email, error_msg)
-            print(f"Failed: {error_msg}")
+            if len(batch) > 1:
+                print(f"Sending batch of {len(batch)} emails...", flush=True)
 
-            if "429" in error_msg or "quota" in error_msg.lower():
+            try:
+                errors = gmail.send_batch(batch)
+            except Exception as e:
+                errors = [str(e)] * len(batch)
+
+            rate_limited = False
+            for i, ((email, _, _), error_msg) in enumerate(zip(batch, errors), start + 1):
+                print(f"[{i}/{len(messages)}] Sending to {email}...", end=" ")
+
+                if error_msg is None:
+                    progress.mark_sent(email)
+                    sent_count += 1
+                    print("Sent")
+                else:
+                    progress.mark_failed(email, error_msg)
+                    print(f"Failed: {error_msg}")
+
+                    if "429" in error_msg or "quota" in error_msg.lower():
+                        rate_limited = True
+
+            if rate_limited:
                 print("\nRate limit hit! Waiting 5 minutes before retry...")
                 wait_with_countdown(300)
 
-        # Wait between emails (except after last one)
-        if i < len(pending):
-            delay = calculate_delay(config)
-            wait_with_countdown(delay)
+            # Wait between batches (except after last one)
+            if start + batch_size < len(messages):
+                delay = calculate_delay(config)
+                wait_with_countdown(delay)
+    finally:
+        progress.close()
 
     # Summary
     print("\n" + "=" * 60)
@@ -559,7 +889,11 @@ def run_campaign(dry_run: bool = False, limit: int | None = None, test_email: st
     print(f"Sent this run: {sent_count}")
     print(f"Total sent: {len(progress.data['sent'])}")
     print(f"Total failed: {len(progress.data['failed'])}")
-    print(f"Remaining: {len(recipients) - len(progress.data['sent']) - len(progress.data['failed'])}")
+    remaining = sum(
+        1 for r in recipients
+        if not progress.is_sent(r["email"]) and r["email"] not in progress.data["failed"]
+    )
+    print(f"Remaining: {remaining}")
 
 
 def main():